@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""Regenerate the prebuilt FTS5 index fixture used by the test suite.
+
+Builds tests/data/fts_sample.sqlite from the sample HTML files in tests/data.
+Re-run this whenever the index schema (SCHEMA_VERSION in search.py) or the
+text extraction changes; the tests refuse to use a stale fixture.
+
+Usage:
+  python scripts/build_test_index.py
+"""
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = Path("tests") / "data"
+FIXTURE = DATA_DIR / "fts_sample.sqlite"
+
+
+def main() -> int:
+    sys.path.insert(0, str(REPO_ROOT / "src"))
+    from qt4_doc_mcp_server.search import build_index
+
+    # Build with repo-relative paths so no local path ends up in meta.doc_base
+    os.chdir(REPO_ROOT)
+    # Pin the bs4/lxml extractor; test_prebuilt_index_fixture_is_current
+    # compares against an lxml build
+    stats = build_index(FIXTURE, DATA_DIR, html_parser="lxml")
+    print(f"Wrote {FIXTURE} ({stats['indexed']} docs, {FIXTURE.stat().st_size} bytes)")
+    return 0 if stats["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
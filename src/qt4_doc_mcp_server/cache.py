@@ -1,13 +1,14 @@
 """Caching helpers: in-memory LRU and Markdown store (disk) primitives."""
 from __future__ import annotations
 
-from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
+import functools
 import hashlib
 import json
 import os
+import time
 
 
 @dataclass
@@ -21,39 +22,83 @@ class CachedDoc:
 class LRUCache:
     def __init__(self, capacity: int = 128):
         self.capacity = max(1, int(capacity))
-        self._data: OrderedDict[str, CachedDoc] = OrderedDict()
+        # Plain dicts keep insertion order; the first key is least recently used
+        self._data: dict[str, CachedDoc] = {}
 
     def get(self, key: str) -> CachedDoc | None:
-        val = self._data.get(key)
+        val = self._data.pop(key, None)
         if val is not None:
-            self._data.move_to_end(key)
+            self._data[key] = val
         return val
 
     def put(self, key: str, value: CachedDoc) -> None:
         if key in self._data:
-            self._data.move_to_end(key)
+            del self._data[key]
         self._data[key] = value
         if len(self._data) > self.capacity:
-            self._data.popitem(last=False)
+            del self._data[next(iter(self._data))]
+
+
+# Shard directories already known to exist; avoids a mkdir per write
+_SHARD_READY: set[Path] = set()
+
+
+# Recently missed store paths -> time.monotonic() of the miss (insertion-
+# ordered, oldest evicted first) so repeated reads of not-yet-converted docs
+# skip the filesystem. Entries expire so pages written by another process
+# (e.g. qt4-doc-warm-md) are picked up again.
+_MD_MISS: dict[Path, float] = {}
+_MD_MISS_CAPACITY = 4096
+_MD_MISS_TTL = 30.0
+
+
+@functools.lru_cache(maxsize=4096)
+def _hash_url(canonical_url: str) -> str:
+    return hashlib.sha256(canonical_url.encode("utf-8")).hexdigest()
 
 
 def md_store_path(base: Path, canonical_url: str) -> Path:
-    h = hashlib.sha256(canonical_url.encode("utf-8")).hexdigest()
+    h = _hash_url(canonical_url)
     return base / h[:2] / f"{h}.md"
 
 
 def md_store_meta_path(base: Path, canonical_url: str) -> Path:
-    h = hashlib.sha256(canonical_url.encode("utf-8")).hexdigest()
+    h = _hash_url(canonical_url)
     return base / h[:2] / f"{h}.meta.json"
 
 
+def md_store_prepare(base: Path) -> None:
+    """Create all 256 shard directories of the Markdown store up front."""
+    for i in range(256):
+        shard = base / f"{i:02x}"
+        shard.mkdir(parents=True, exist_ok=True)
+        _SHARD_READY.add(shard)
+
+
+def md_store_known_missing(base: Path, canonical_url: str) -> bool:
+    """Return True if a recent md_store_read found no entry for the URL."""
+    md_path = md_store_path(base, canonical_url)
+    missed_at = _MD_MISS.get(md_path)
+    if missed_at is None:
+        return False
+    if time.monotonic() - missed_at >= _MD_MISS_TTL:
+        del _MD_MISS[md_path]
+        return False
+    return True
+
+
 def md_store_read(base: Path, canonical_url: str) -> CachedDoc | None:
     md_path = md_store_path(base, canonical_url)
     meta_path = md_store_meta_path(base, canonical_url)
-    if not md_path.exists() or not meta_path.exists():
-        return None
+    # Open directly instead of stat-ing first; a missing file is just an OSError
     try:
         markdown = md_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        _MD_MISS.pop(md_path, None)
+        _MD_MISS[md_path] = time.monotonic()
+        if len(_MD_MISS) > _MD_MISS_CAPACITY:
+            del _MD_MISS[next(iter(_MD_MISS))]
+        return None
     except OSError:
         return None
     try:
@@ -67,23 +112,43 @@ def md_store_read(base: Path, canonical_url: str) -> CachedDoc | None:
     return CachedDoc(canonical_url=canonical_url, title=title, markdown=markdown, links=links)
 
 
-def md_store_write(base: Path, canonical_url: str, doc: CachedDoc) -> None:
+def _write_tmp(path: Path, text: str, durable: bool) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def md_store_write(
+    base: Path, canonical_url: str, doc: CachedDoc, *, durable: bool = False
+) -> None:
+    """Atomically write a document to the Markdown store.
+
+    The store is a rebuildable cache (entries can always be reconverted from
+    the HTML docs), so files are not fsynced unless ``durable`` is set;
+    ``os.replace`` still guarantees readers never see a partial file.
+    """
     md_path = md_store_path(base, canonical_url)
     meta_path = md_store_meta_path(base, canonical_url)
-    md_path.parent.mkdir(parents=True, exist_ok=True)
+    shard = md_path.parent
+    if shard not in _SHARD_READY:
+        shard.mkdir(parents=True, exist_ok=True)
+        _SHARD_READY.add(shard)
 
     tmp_md = md_path.with_suffix(".md.tmp")
     tmp_meta = meta_path.with_suffix(".meta.json.tmp")
 
-    with open(tmp_md, "w", encoding="utf-8") as f:
-        f.write(doc.markdown)
-        f.flush()
-        os.fsync(f.fileno())
-
-    with open(tmp_meta, "w", encoding="utf-8") as f:
-        json.dump({"title": doc.title, "links": doc.links}, f)
-        f.flush()
-        os.fsync(f.fileno())
+    try:
+        _write_tmp(tmp_md, doc.markdown, durable)
+    except FileNotFoundError:
+        # The store was removed since the shard was created; recreate it
+        _SHARD_READY.discard(shard)
+        shard.mkdir(parents=True, exist_ok=True)
+        _SHARD_READY.add(shard)
+        _write_tmp(tmp_md, doc.markdown, durable)
+    _write_tmp(tmp_meta, json.dumps({"title": doc.title, "links": doc.links}), durable)
 
     os.replace(tmp_md, md_path)
     os.replace(tmp_meta, meta_path)
+    _MD_MISS.pop(md_path, None)
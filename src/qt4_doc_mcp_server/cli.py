@@ -1,22 +1,68 @@
 from __future__ import annotations
 
 import argparse
+import os
 import sys
 import time
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from pathlib import Path
 
-from .config import load_settings, ensure_dirs, validate_settings
+from .cache import md_store_prepare
+from .config import Settings, load_settings, ensure_dirs, validate_settings
 from .doc_service import get_markdown_for_url
-from .search import build_index
+from .search import build_index, index_is_current, walk_html_files
 
 
 BASE_CANONICAL = "https://doc.qt.io/archives/qt-4.8/"
 
 
-def _iter_html_files(root: Path):
-    for p in root.rglob("*.html"):
-        if p.is_file():
-            yield p
+def _iter_html_files(root: Path) -> list[str]:
+    """Return sorted paths (as POSIX strings) of HTML files relative to root."""
+    return sorted(
+        os.path.relpath(p, root).replace(os.sep, "/") for p in walk_html_files(root)
+    )
+
+
+def _warm_one(url: str, settings: Settings) -> int:
+    """Convert one page into the Markdown store (runs in a worker process)."""
+    doc = get_markdown_for_url(url, settings, None)
+    return len(doc.markdown)
+
+
+def _warm_results(
+    rels: list[str], settings: Settings
+) -> Iterator[tuple[str, int | None, Exception | None]]:
+    """Yield (rel, markdown_length, error) per file as conversions complete.
+
+    Conversions run in a process pool with at most 2*cpu tasks in flight so
+    memory stays bounded; the per-URL sharded store keeps writes disjoint.
+    """
+    workers = os.cpu_count() or 1
+    if workers <= 1:
+        for rel in rels:
+            try:
+                yield rel, _warm_one(BASE_CANONICAL + rel, settings), None
+            except Exception as e:
+                yield rel, None, e
+        return
+
+    max_in_flight = 2 * workers
+    todo = iter(rels)
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        pending = {}
+        while True:
+            for rel in todo:
+                pending[ex.submit(_warm_one, BASE_CANONICAL + rel, settings)] = rel
+                if len(pending) >= max_in_flight:
+                    break
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                rel = pending.pop(fut)
+                err = fut.exception()
+                yield rel, (None if err else fut.result()), err
 
 
 def warm_md_main(argv: list[str] | None = None) -> int:
@@ -34,26 +80,24 @@ def warm_md_main(argv: list[str] | None = None) -> int:
         return 2
 
     root = settings.qt_doc_base or Path('.')
-    files = list(_iter_html_files(root))
+    rels = _iter_html_files(root)
     if args.limit and args.limit > 0:
-        files = files[: args.limit]
-    total = len(files)
+        rels = rels[: args.limit]
+    total = len(rels)
     if total == 0:
         print("No HTML files found under QT_DOC_BASE", file=sys.stderr)
         return 1
 
     print(f"Warming Markdown store from {total} HTML files...")
+    md_store_prepare(settings.md_cache_dir)
     t0 = time.monotonic()
     total_md = 0
     last_len = 0
-    for i, f in enumerate(files, 1):
-        rel = f.relative_to(root).as_posix()
-        url = BASE_CANONICAL + rel
-        try:
-            doc = get_markdown_for_url(url, settings, None)
-            total_md += len(doc.markdown)
-        except Exception as e:
-            print(f"\nError converting {rel}: {e}", file=sys.stderr)
+    for i, (rel, md_len, err) in enumerate(_warm_results(rels, settings), 1):
+        if err is not None:
+            print(f"\nError converting {rel}: {err}", file=sys.stderr)
+        else:
+            total_md += md_len
         # progress
         pct = i * 100.0 / total
         elapsed = max(time.monotonic() - t0, 1e-6)
@@ -100,12 +144,17 @@ def build_index_main(argv: list[str] | None = None) -> int:
 
     # Check if index exists
     if index_path.exists() and not args.force:
+        if index_is_current(index_path):
+            print(
+                f"Index already exists at {index_path}",
+                file=sys.stderr
+            )
+            print("Use --force to rebuild", file=sys.stderr)
+            return 0
         print(
-            f"Index already exists at {index_path}",
+            f"Index at {index_path} uses an outdated schema; rebuilding",
             file=sys.stderr
         )
-        print("Use --force to rebuild", file=sys.stderr)
-        return 0
 
     print(f"Building search index from {docs_base}")
     print(f"Index will be written to {index_path}")
@@ -134,7 +183,12 @@ def build_index_main(argv: list[str] | None = None) -> int:
         last_len = len(msg)
 
     try:
-        stats = build_index(index_path, docs_base, progress_callback=progress)
+        stats = build_index(
+            index_path,
+            docs_base,
+            progress_callback=progress,
+            html_parser=settings.html_parser,
+        )
         sys.stderr.write("\n")
 
         elapsed = time.monotonic() - t0
@@ -26,6 +26,7 @@ class Settings:
     md_cache_size: int = 512
     mcp_log_level: str = "WARNING"
     default_max_markdown_length: int = 20000
+    html_parser: str | None = None
 
 
 def load_settings() -> Settings:
@@ -55,6 +56,7 @@ def load_settings() -> Settings:
     s.md_cache_size = int(os.getenv("MD_CACHE_SIZE", str(s.md_cache_size)))
     s.mcp_log_level = os.getenv("MCP_LOG_LEVEL", s.mcp_log_level)
     s.default_max_markdown_length = int(os.getenv("DEFAULT_MAX_MARKDOWN_LENGTH", str(s.default_max_markdown_length)))
+    s.html_parser = os.getenv("HTML_PARSER") or s.html_parser
     return s
 
 
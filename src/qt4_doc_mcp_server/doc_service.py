@@ -2,7 +2,13 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from .cache import CachedDoc, LRUCache, md_store_read, md_store_write
+from .cache import (
+    CachedDoc,
+    LRUCache,
+    md_store_known_missing,
+    md_store_read,
+    md_store_write,
+)
 from .config import Settings
 from .convert import extract_main, normalize_links, slice_fragment, to_markdown
 from .errors import DocumentationError, FetchError, ParseError
@@ -36,7 +42,9 @@ def get_markdown_for_url(
         if cached:
             return cached
 
-    stored = md_store_read(settings.md_cache_dir, canonical) if cache_enabled else None
+    stored = None
+    if cache_enabled and not md_store_known_missing(settings.md_cache_dir, canonical):
+        stored = md_store_read(settings.md_cache_dir, canonical)
     if stored:
         if md_lru:
             md_lru.put(canonical, stored)
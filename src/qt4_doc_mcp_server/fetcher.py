@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from pathlib import Path, PurePosixPath
 from urllib.parse import urlparse
+import functools
 import os
 import posixpath
 
@@ -12,6 +13,7 @@ ARCHIVE_PREFIX = "/archives/qt-4.8/"
 CANONICAL_HOST = "doc.qt.io"
 
 
+@functools.lru_cache(maxsize=4096)
 def canonicalize_url(url: str) -> str:
     """Validate and normalize a canonical Qt 4.8 docs URL.
 
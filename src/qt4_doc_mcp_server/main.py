@@ -78,10 +78,11 @@ def run() -> None:
     if settings.preindex_docs:
         try:
             from .cli import build_index_main
+            from .search import index_is_current
 
             logger.info("PREINDEX_DOCS=true: building search index before start...")
-            # Only build if index doesn't exist
-            if not settings.index_db_path.exists():
+            # Only build if index doesn't exist or predates the current schema
+            if not index_is_current(settings.index_db_path):
                 rc = build_index_main([])
                 if rc != 0:
                     logger.warning("Index build exited with code %s", rc)
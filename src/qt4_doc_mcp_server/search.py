@@ -5,27 +5,69 @@ HTML documentation and provides fast ranked search with context snippets.
 """
 from __future__ import annotations
 
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from itertools import repeat
 from pathlib import Path
+import os
+import re
 import sqlite3
 import logging
-from typing import List, Tuple
+import threading
 
 try:
     from bs4 import BeautifulSoup
 except Exception:
     BeautifulSoup = None
 
+try:
+    # Optional fast path: lexbor-backed parser, much cheaper than bs4 for
+    # plain text extraction
+    from selectolax.lexbor import LexborHTMLParser
+except Exception:
+    LexborHTMLParser = None
+
 from .errors import DocumentationError
 
 logger = logging.getLogger(__name__)
 
+# bs4 tree builder: lxml is several times faster than the stdlib parser, so
+# make a missing lxml visible instead of silently degrading
+try:
+    import lxml  # noqa: F401
+
+    _PARSER = "lxml"
+except ImportError:
+    _PARSER = "html.parser"
+    logger.warning("lxml not installed; index builds fall back to the slower html.parser")
+
 
-# FTS5 schema with unicode61 tokenizer for proper text handling
+# Fallback <title> extraction when no HTML parser is installed; only the head
+# of the document is scanned
+_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+_TITLE_RE_BYTES = re.compile(rb"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+_TITLE_SCAN_BYTES = 4096
+
+# Page chrome stripped before extraction (same set as convert.py)
+_CHROME_SELECTOR = (
+    "div.header, div.nav, div.sidebar, "
+    "div.breadcrumbs, div.ft, div.footer, div.qt-footer"
+)
+# Candidate main-content containers, most specific first
+_MAIN_SELECTORS = ("div.content.mainContent", "div.mainContent", "div.content")
+_HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+_HEADING_SELECTOR = ", ".join(_HEADING_TAGS)
+
+# Bump whenever FTS5_SCHEMA changes so existing indexes get rebuilt
+SCHEMA_VERSION = "2"
+
+# FTS5 schema with unicode61 tokenizer for proper text handling; prefix
+# indexes make "QStr*"-style queries avoid a full doclist walk
 FTS5_SCHEMA = (
     "CREATE VIRTUAL TABLE IF NOT EXISTS docs USING fts5("
     "title, headings, body, url UNINDEXED, path_rel UNINDEXED, "
-    "tokenize='unicode61 remove_diacritics 2'"
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'"
     ");"
 )
 
@@ -36,6 +78,41 @@ META_SCHEMA = (
     ");"
 )
 
+# Number of rows buffered before flushing to SQLite with executemany
+INSERT_BATCH_SIZE = 500
+
+# Bulk-load pragmas: the index is rebuilt from scratch, so durability of the
+# intermediate state does not matter
+BUILD_PRAGMAS = (
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-200000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# HTML parsing is fanned out to worker processes; below this many files the
+# pool startup cost outweighs the gain and parsing stays in-process
+PARALLEL_MIN_FILES = 64
+PARSE_CHUNK_SIZE = 32
+
+INSERT_DOC_SQL = (
+    "INSERT INTO docs (title, headings, body, url, path_rel) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+
+
+# Read-side tuning for the persistent query connection
+READ_PRAGMAS = (
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA query_only=1",
+)
+
+# Persistent read-only connections keyed by database path. Each entry also
+# records the file identity so a rebuilt index is picked up on the next query.
+_CONN_CACHE: dict[str, tuple[tuple[int, int, int], sqlite3.Connection]] = {}
+_CONN_LOCK = threading.Lock()
+
 
 @dataclass
 class SearchResult:
@@ -73,50 +150,160 @@ def ensure_index(db_path: Path) -> None:
         raise IndexError(f"Failed to initialize index schema: {e}")
 
 
-def _extract_text_content(html: str) -> Tuple[str, str, str]:
-    """Extract title, headings, and body text from HTML.
+def index_is_current(db_path: Path) -> bool:
+    """Return True if an index exists at db_path with the current schema."""
+    if not db_path.exists():
+        return False
+    try:
+        con = sqlite3.connect(db_path.resolve().as_uri() + "?mode=ro", uri=True)
+        try:
+            row = con.execute(
+                "SELECT value FROM meta WHERE key = 'schema_version'"
+            ).fetchone()
+        finally:
+            con.close()
+    except sqlite3.Error:
+        return False
+    return row is not None and row[0] == SCHEMA_VERSION
+
+
+def _get_conn(db_path: Path) -> sqlite3.Connection:
+    """Return a cached read-only connection to the index at ``db_path``."""
+    try:
+        st = db_path.stat()
+    except FileNotFoundError:
+        # Removed since the caller's exists() check (e.g. a rebuild elsewhere)
+        raise SearchUnavailable(f"Search index not found at {db_path}")
+    ident = (st.st_ino, st.st_size, st.st_mtime_ns)
+    key = str(db_path)
+    with _CONN_LOCK:
+        cached = _CONN_CACHE.get(key)
+        if cached is not None:
+            if cached[0] == ident:
+                return cached[1]
+            cached[1].close()
+            del _CONN_CACHE[key]
+
+        con = sqlite3.connect(
+            db_path.resolve().as_uri() + "?mode=ro",
+            uri=True,
+            check_same_thread=False,
+        )
+        con.row_factory = sqlite3.Row
+        for pragma in READ_PRAGMAS:
+            con.execute(pragma)
+        _CONN_CACHE[key] = (ident, con)
+        return con
+
+
+def _close_conn(db_path: Path) -> None:
+    """Drop the cached connection for ``db_path`` (e.g. before a rebuild)."""
+    with _CONN_LOCK:
+        cached = _CONN_CACHE.pop(str(db_path), None)
+    if cached is not None:
+        cached[1].close()
+
+
+def _extract_text_content_lexbor(html: str | bytes) -> tuple[str, str, str]:
+    """selectolax variant of `_extract_text_content`.
+
+    Matches the bs4 path on well-formed UTF-8 pages such as the Qt docs, with
+    known differences elsewhere: raw bytes are always decoded as UTF-8 (a
+    ``<meta charset>`` is ignored, bs4 sniffs it), and a page without
+    ``<body>`` gets an empty body text where bs4 includes the title.
+    """
+    tree = LexborHTMLParser(html)
+
+    # Remove navigation and chrome (same as convert.py)
+    for el in tree.css(_CHROME_SELECTOR):
+        el.decompose()
+
+    # Extract title
+    title_el = tree.css_first("h1") or tree.css_first("title")
+    title = title_el.text(strip=True) if title_el else ""
+
+    # Find main content area
+    # lexbor always synthesizes a <body>
+    main = next(
+        (el for sel in _MAIN_SELECTORS if (el := tree.css_first(sel)) is not None),
+        None,
+    ) or tree.body
+
+    # bs4's get_text skips script/style content; drop them before any text
+    # is read
+    for el in main.css("script, style"):
+        el.decompose()
+
+    # Extract headings (h1-h6), grouped by level like the bs4 path
+    headings = []
+    for tag in _HEADING_TAGS:
+        for heading in main.css(tag):
+            text = heading.text(strip=True)
+            if text:
+                headings.append(text)
+
+    headings_text = " ".join(headings)
+
+    # Extract body text (remove heading tags first to avoid duplication).
+    # Mirror bs4's get_text(" ", strip=True) by skipping whitespace-only
+    # text nodes.
+    for el in main.css(_HEADING_SELECTOR):
+        el.decompose()
+
+    body_text = " ".join(
+        text
+        for node in main.traverse(include_text=True)
+        if node.tag == "-text" and (text := node.text_content.strip())
+    )
+
+    return title, headings_text, body_text
+
+
+def _extract_text_content(
+    html: str | bytes, html_parser: str | None = None
+) -> tuple[str, str, str]:
+    """Extract title, headings, and body text from HTML (text or raw bytes).
 
     Returns (title, headings_text, body_text).
     Headings are concatenated h1-h6 tags; body is all other text.
+    Uses selectolax when installed and falls back to BeautifulSoup; an
+    explicit ``html_parser`` forces BeautifulSoup with that tree builder.
     """
+    if LexborHTMLParser is not None and html_parser is None:
+        return _extract_text_content_lexbor(html)
+
     if BeautifulSoup is None:
         # Fallback: simple title extraction
-        title = ""
-        start = html.lower().find("<title>")
-        end = html.lower().find("</title>")
-        if start != -1 and end != -1 and end > start:
-            title = html[start + 7 : end].strip()
+        if isinstance(html, bytes):
+            m = _TITLE_RE_BYTES.search(html, 0, _TITLE_SCAN_BYTES)
+            title = m.group(1).decode("utf-8", "replace").strip() if m else ""
+        else:
+            m = _TITLE_RE.search(html, 0, _TITLE_SCAN_BYTES)
+            title = m.group(1).strip() if m else ""
         return title, "", ""
 
-    soup = BeautifulSoup(html, "lxml" if "lxml" else "html.parser")
+    soup = BeautifulSoup(html, html_parser or _PARSER)
 
-    # Remove navigation and chrome (same as convert.py)
-    for sel in [
-        "div.header", "div.nav", "div.sidebar",
-        "div.breadcrumbs", "div.ft", "div.footer", "div.qt-footer"
-    ]:
-        for el in soup.select(sel):
-            el.decompose()
+    # Remove navigation and chrome (same as convert.py) in a single traversal
+    for el in soup.select(_CHROME_SELECTOR):
+        el.decompose()
 
     # Extract title
     title_el = soup.find("h1") or soup.find("title")
     title = title_el.get_text(strip=True) if title_el else ""
 
     # Find main content area
-    main = (
-        soup.select_one("div.content.mainContent")
-        or soup.select_one("div.mainContent")
-        or soup.select_one("div.content")
-        or soup.body
-        or soup
-    )
+    main = next(
+        (el for sel in _MAIN_SELECTORS if (el := soup.select_one(sel)) is not None),
+        None,
+    ) or soup.body or soup
 
     if main is None:
         return title, "", ""
 
     # Extract headings (h1-h6)
     headings = []
-    for tag in ["h1", "h2", "h3", "h4", "h5", "h6"]:
+    for tag in _HEADING_TAGS:
         for heading in main.find_all(tag):
             text = heading.get_text(strip=True)
             if text:
@@ -124,37 +311,99 @@ def _extract_text_content(html: str) -> Tuple[str, str, str]:
 
     headings_text = " ".join(headings)
 
-    # Extract body text (remove heading tags first to avoid duplication)
-    body_copy = BeautifulSoup(str(main), "lxml" if "lxml" else "html.parser")
-    for tag in ["h1", "h2", "h3", "h4", "h5", "h6"]:
-        for heading in body_copy.find_all(tag):
-            heading.decompose()
+    # Extract body text (remove heading tags first to avoid duplication).
+    # The tree is discarded afterwards, so mutate it in place rather than
+    # re-parsing a serialized copy.
+    for heading in main.find_all(_HEADING_TAGS):
+        heading.extract()
 
-    body_text = body_copy.get_text(separator=" ", strip=True)
+    body_text = main.get_text(separator=" ", strip=True)
 
     return title, headings_text, body_text
 
 
-def build_index(db_path: Path, docs_base: Path, progress_callback=None) -> dict:
+def walk_html_files(root: Path | str) -> Iterator[str]:
+    """Yield paths of all ``*.html`` files under root (unsorted).
+
+    Uses ``os.scandir`` directly so directory entries are classified from
+    their cached type without a stat or ``Path`` object per entry.
+    Directory symlinks are not followed. Directories that cannot be listed
+    (permissions, removed mid-walk) are skipped, as ``Path.rglob`` does.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".html") and entry.is_file():
+                    yield entry.path
+
+
+def _parse_one(
+    path: str, docs_base: str, html_parser: str | None = None
+) -> tuple[str, tuple[str, str, str] | None, str | None]:
+    """Read and extract a single HTML file (runs in a worker process).
+
+    Returns (path_rel, (title, headings, body) or None, error message or None).
+    """
+    path_rel = os.path.relpath(path, docs_base).replace(os.sep, "/")
+    try:
+        # Hand raw bytes to the parser; it sniffs the encoding itself and
+        # avoids a separate full-file decode
+        html_bytes = Path(path).read_bytes()
+        return path_rel, _extract_text_content(html_bytes, html_parser), None
+    except Exception as e:
+        return path_rel, None, str(e)
+
+
+def _check_html_parser(html_parser: str) -> None:
+    """Raise IndexError unless BeautifulSoup can use the given tree builder."""
+    if BeautifulSoup is None:
+        raise IndexError(
+            f"HTML parser {html_parser!r} requested but beautifulsoup4 is not installed"
+        )
+    try:
+        BeautifulSoup("", html_parser)
+    except ValueError as e:  # bs4.FeatureNotFound
+        raise IndexError(f"Unknown HTML parser {html_parser!r}: {e}")
+
+
+def build_index(
+    db_path: Path,
+    docs_base: Path,
+    progress_callback=None,
+    *,
+    html_parser: str | None = None,
+) -> dict:
     """Build the FTS5 index from local HTML docs.
 
     Args:
         db_path: Path to SQLite database file
         docs_base: Root directory containing HTML files
         progress_callback: Optional callable(current, total, path) for progress updates
+        html_parser: BeautifulSoup tree builder to force (e.g. "lxml");
+            None picks selectolax, then lxml, then html.parser
 
     Returns:
         dict with stats: indexed, skipped, errors
     """
     if not docs_base.exists() or not docs_base.is_dir():
         raise IndexError(f"Documentation base directory not found: {docs_base}")
+    if html_parser is not None:
+        # Fail before the existing index is removed, not once per file
+        _check_html_parser(html_parser)
 
-    # Collect all HTML files in deterministic order
-    html_files = sorted(docs_base.rglob("*.html"))
-    if not html_files:
+    # Collect all HTML files in deterministic (component-wise) order
+    paths = sorted(walk_html_files(docs_base), key=lambda p: p.split(os.sep))
+    if not paths:
         raise IndexError(f"No HTML files found under {docs_base}")
 
-    logger.info(f"Building index from {len(html_files)} HTML files")
+    logger.info(f"Building index from {len(paths)} HTML files")
 
     stats = {"indexed": 0, "skipped": 0, "errors": 0}
 
@@ -163,6 +412,7 @@ def build_index(db_path: Path, docs_base: Path, progress_callback=None) -> dict:
         db_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Remove existing database for clean rebuild
+        _close_conn(db_path)
         if db_path.exists():
             db_path.unlink()
 
@@ -170,11 +420,16 @@ def build_index(db_path: Path, docs_base: Path, progress_callback=None) -> dict:
         try:
             # Enable WAL mode for better concurrency
             con.execute("PRAGMA journal_mode=WAL")
+            for pragma in BUILD_PRAGMAS:
+                con.execute(pragma)
 
             cur = con.cursor()
             cur.execute(FTS5_SCHEMA)
             cur.execute(META_SCHEMA)
 
+            # Single explicit transaction for the whole bulk load
+            con.execute("BEGIN")
+
             # Store metadata
             cur.execute(
                 "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
@@ -182,42 +437,61 @@ def build_index(db_path: Path, docs_base: Path, progress_callback=None) -> dict:
             )
             cur.execute(
                 "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
-                ("total_files", str(len(html_files)))
+                ("total_files", str(len(paths)))
+            )
+            cur.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                ("schema_version", SCHEMA_VERSION)
             )
 
-            # Index each file
-            for idx, html_path in enumerate(html_files):
-                if progress_callback:
-                    progress_callback(idx + 1, len(html_files), html_path)
-
-                try:
-                    # Read HTML
-                    html_content = html_path.read_text(encoding="utf-8", errors="replace")
+            # Index each file, buffering rows for batched inserts
+            batch: list[tuple[str, str, str, str, str]] = []
+            bases = repeat(str(docs_base))
+            parsers = repeat(html_parser)
+            max_workers = os.cpu_count() or 1
+            executor = None
+            if max_workers > 1 and len(paths) >= PARALLEL_MIN_FILES:
+                executor = ProcessPoolExecutor(max_workers=max_workers)
+                parsed = executor.map(
+                    _parse_one, paths, bases, parsers, chunksize=PARSE_CHUNK_SIZE
+                )
+            else:
+                parsed = map(_parse_one, paths, bases, parsers)
+
+            try:
+                # Results arrive in input order, keeping inserts deterministic
+                for idx, (html_path, (path_rel, extracted, error)) in enumerate(
+                    zip(paths, parsed)
+                ):
+                    if progress_callback:
+                        progress_callback(idx + 1, len(paths), Path(html_path))
+
+                    if error is not None:
+                        logger.warning(f"Failed to index {html_path}: {error}")
+                        stats["errors"] += 1
+                        continue
 
-                    # Extract content
-                    title, headings, body = _extract_text_content(html_content)
+                    title, headings, body = extracted
 
                     # Skip if no meaningful content
                     if not title and not body:
                         stats["skipped"] += 1
                         continue
 
-                    # Compute relative path and canonical URL
-                    path_rel = html_path.relative_to(docs_base).as_posix()
                     canonical_url = f"https://doc.qt.io/archives/qt-4.8/{path_rel}"
-
-                    # Insert into FTS5 table
-                    cur.execute(
-                        "INSERT INTO docs (title, headings, body, url, path_rel) "
-                        "VALUES (?, ?, ?, ?, ?)",
-                        (title, headings, body, canonical_url, path_rel)
-                    )
-
+                    batch.append((title, headings, body, canonical_url, path_rel))
                     stats["indexed"] += 1
 
-                except Exception as e:
-                    logger.warning(f"Failed to index {html_path}: {e}")
-                    stats["errors"] += 1
+                    if len(batch) >= INSERT_BATCH_SIZE:
+                        cur.executemany(INSERT_DOC_SQL, batch)
+                        batch.clear()
+            finally:
+                if executor is not None:
+                    executor.shutdown(cancel_futures=True)
+
+            if batch:
+                cur.executemany(INSERT_DOC_SQL, batch)
+                batch.clear()
 
             # Optimize index for better query performance
             logger.info("Optimizing index...")
@@ -229,6 +503,10 @@ def build_index(db_path: Path, docs_base: Path, progress_callback=None) -> dict:
             logger.info("Compacting database...")
             con.execute("VACUUM")
 
+            # Leave the finished index in rollback-journal mode so read-only
+            # query connections never need -wal/-shm side files
+            con.execute("PRAGMA journal_mode=DELETE")
+
         finally:
             con.close()
 
@@ -248,7 +526,7 @@ def search(
     query: str,
     limit: int = 10,
     scope: str = "all"
-) -> List[SearchResult]:
+) -> list[SearchResult]:
     """Run a MATCH query and return ranked results with snippets.
 
     Args:
@@ -267,12 +545,11 @@ def search(
         return []
 
     try:
-        con = sqlite3.connect(str(db_path))
+        con = _get_conn(db_path)
+        cur = con.cursor()
         try:
-            cur = con.cursor()
-
             # Build FTS5 query - search across title, headings, and body
-            # Use BM25 ranking (default in FTS5)
+            # Use BM25 ranking weighted title > headings > body
             fts_query = query.strip()
 
             # Execute search with snippet generation
@@ -283,19 +560,20 @@ def search(
                 SELECT
                     title,
                     url,
-                    bm25(docs) as score,
+                    bm25(docs, 10.0, 5.0, 1.0) as score,
                     snippet(docs, 2, '<b>', '</b>', '…', 10) as context
                 FROM docs
                 WHERE docs MATCH ?
-                ORDER BY bm25(docs) ASC
+                ORDER BY score ASC
                 LIMIT ?
                 """,
                 (fts_query, limit)
             )
 
             results = []
-            for row in cur.fetchall():
-                title, url, score, context = row
+            for row in cur:
+                title = row["title"]
+                context = row["context"]
 
                 # Clean up context snippet
                 if not context or context.strip() == "":
@@ -304,20 +582,22 @@ def search(
 
                 results.append(SearchResult(
                     title=title or "Untitled",
-                    url=url,
-                    score=abs(score),  # BM25 returns negative scores; abs for clarity
+                    url=row["url"],
+                    score=abs(row["score"]),  # BM25 returns negative scores; abs for clarity
                     context=context
                 ))
 
             return results
 
         finally:
-            con.close()
+            cur.close()
 
     except sqlite3.OperationalError as e:
         if "no such table" in str(e).lower():
             raise SearchUnavailable("Search index not initialized")
         raise IndexError(f"Search query failed: {e}")
+    except SearchUnavailable:
+        raise
     except Exception as e:
         raise IndexError(f"Search error: {e}")
 
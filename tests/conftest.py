@@ -0,0 +1,23 @@
+"""Shared pytest configuration."""
+import pytest
+
+from qt4_doc_mcp_server import tools
+
+
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    """Keep tests sharing the session-built index on one xdist worker.
+
+    Only takes effect with ``--dist loadgroup``; tests that build their own
+    index stay ungrouped and spread across workers.
+    """
+    for item in items:
+        if "_prebuilt_index" in getattr(item, "fixturenames", ()):
+            item.add_marker(pytest.mark.xdist_group("search_index"))
+
+
+@pytest.fixture(autouse=True)
+def _reset_tool_state():
+    """Drop settings/LRU configured by a test so workers stay isolated."""
+    yield
+    tools._settings = None
+    tools._md_lru = None
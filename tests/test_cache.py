@@ -0,0 +1,98 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+import qt4_doc_mcp_server.cache as cache_mod
+from qt4_doc_mcp_server.cache import (
+    CachedDoc,
+    LRUCache,
+    md_store_known_missing,
+    md_store_path,
+    md_store_prepare,
+    md_store_read,
+    md_store_write,
+)
+
+
+def _doc(name: str) -> CachedDoc:
+    return CachedDoc(canonical_url=name, title=name, markdown=name, links=[])
+
+
+def test_lru_evicts_least_recently_used() -> None:
+    lru = LRUCache(2)
+    lru.put("a", _doc("a"))
+    lru.put("b", _doc("b"))
+
+    # Touch "a" so "b" becomes the eviction candidate
+    assert lru.get("a") is not None
+    lru.put("c", _doc("c"))
+
+    assert lru.get("b") is None
+    assert lru.get("a") is not None
+    assert lru.get("c") is not None
+
+
+def test_lru_put_existing_key_refreshes_value() -> None:
+    lru = LRUCache(2)
+    lru.put("a", _doc("a"))
+    lru.put("b", _doc("b"))
+    lru.put("a", _doc("a2"))
+    lru.put("c", _doc("c"))
+
+    assert lru.get("b") is None
+    cached = lru.get("a")
+    assert cached is not None and cached.title == "a2"
+
+
+def test_md_store_prepare_creates_shards(tmp_path: Path) -> None:
+    base = tmp_path / "md"
+    md_store_prepare(base)
+
+    shards = [p for p in base.iterdir() if p.is_dir()]
+    assert len(shards) == 256
+
+    url = "https://doc.qt.io/archives/qt-4.8/qstring.html"
+    md_store_write(base, url, _doc(url))
+    assert md_store_path(base, url).exists()
+    assert md_store_read(base, url) == _doc(url)
+
+
+def test_md_store_miss_is_remembered_until_write(tmp_path: Path) -> None:
+    base = tmp_path / "md"
+    url = "https://doc.qt.io/archives/qt-4.8/qwidget.html"
+
+    assert not md_store_known_missing(base, url)
+    assert md_store_read(base, url) is None
+    assert md_store_known_missing(base, url)
+
+    md_store_write(base, url, _doc(url))
+    assert not md_store_known_missing(base, url)
+    assert md_store_read(base, url) == _doc(url)
+
+
+def test_md_store_miss_expires(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    base = tmp_path / "md"
+    url = "https://doc.qt.io/archives/qt-4.8/qobject.html"
+    now = [1000.0]
+    monkeypatch.setattr(cache_mod.time, "monotonic", lambda: now[0])
+
+    assert md_store_read(base, url) is None
+    assert md_store_known_missing(base, url)
+
+    # Another process fills the store; the miss must not outlive the TTL
+    now[0] += cache_mod._MD_MISS_TTL
+    assert not md_store_known_missing(base, url)
+
+
+def test_md_store_write_recreates_removed_store(tmp_path: Path) -> None:
+    base = tmp_path / "md"
+    url = "https://doc.qt.io/archives/qt-4.8/qobject.html"
+
+    md_store_write(base, url, _doc(url))
+    shutil.rmtree(base)
+    md_store_write(base, url, _doc(url))
+
+    assert md_store_read(base, url) == _doc(url)
@@ -0,0 +1,115 @@
+import shutil
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+import qt4_doc_mcp_server.cli as cli_mod
+from qt4_doc_mcp_server.cache import md_store_read
+from qt4_doc_mcp_server.cli import BASE_CANONICAL, build_index_main, warm_md_main
+from qt4_doc_mcp_server.search import build_index, index_is_current
+
+pytest.importorskip("bs4")
+
+DATA_DIR = Path(__file__).parent / "data"
+
+PAGE = """
+<html>
+  <head><title>{name}</title></head>
+  <body><div class="mainContent"><h1>{name}</h1><p>Body of {name}.</p></div></body>
+</html>
+"""
+
+
+@pytest.fixture()
+def docs_env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> tuple[Path, Path]:
+    """Point load_settings at a tmp docs tree and Markdown store."""
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    md_dir = tmp_path / "cache" / "md"
+    monkeypatch.setenv("QT_DOC_BASE", str(docs))
+    monkeypatch.setenv("MD_CACHE_DIR", str(md_dir))
+    monkeypatch.setenv("INDEX_DB_PATH", str(tmp_path / "index" / "fts.sqlite"))
+    return docs, md_dir
+
+
+@pytest.mark.parametrize(
+    "stale_sql",
+    [
+        "DELETE FROM meta WHERE key = 'schema_version'",
+        "UPDATE meta SET value = '1' WHERE key = 'schema_version'",
+    ],
+    ids=["missing-version", "old-version"],
+)
+def test_build_index_main_rebuilds_outdated_schema(
+    docs_env: tuple[Path, Path],
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    stale_sql: str,
+) -> None:
+    docs, _ = docs_env
+    for html in DATA_DIR.glob("*.html"):
+        shutil.copyfile(html, docs / html.name)
+    db_path = tmp_path / "index" / "fts.sqlite"
+    build_index(db_path, docs)
+    con = sqlite3.connect(str(db_path))
+    try:
+        con.execute(stale_sql)
+        con.commit()
+    finally:
+        con.close()
+    assert not index_is_current(db_path)
+
+    # No --force: an outdated schema alone triggers the rebuild
+    assert build_index_main([]) == 0
+
+    assert index_is_current(db_path)
+    assert "outdated schema" in capsys.readouterr().err
+
+
+def test_build_index_main_keeps_current_index(
+    docs_env: tuple[Path, Path],
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    docs, _ = docs_env
+    shutil.copyfile(DATA_DIR / "qstring.html", docs / "qstring.html")
+    db_path = tmp_path / "index" / "fts.sqlite"
+    build_index(db_path, docs)
+    mtime = db_path.stat().st_mtime_ns
+
+    assert build_index_main([]) == 0
+
+    assert db_path.stat().st_mtime_ns == mtime
+    assert "Use --force to rebuild" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("cpus", [1, 2], ids=["serial", "pool"])
+def test_warm_md_main_converts_all_and_reports_failures(
+    docs_env: tuple[Path, Path],
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    cpus: int,
+) -> None:
+    docs, md_dir = docs_env
+    # More pages than the 2*cpu in-flight bound of the pool path
+    names = [f"page{i}.html" for i in range(7)]
+    for name in names:
+        (docs / name).write_text(PAGE.format(name=name), encoding="utf-8")
+    # Resolves outside QT_DOC_BASE, so converting it fails with NotAllowed
+    outside = docs.parent / "outside.html"
+    outside.write_text(PAGE.format(name="outside"), encoding="utf-8")
+    try:
+        (docs / "escape.html").symlink_to(outside)
+    except OSError:
+        pytest.skip("symlinks not supported")
+
+    monkeypatch.setattr(cli_mod.os, "cpu_count", lambda: cpus)
+    assert warm_md_main([]) == 0
+
+    for name in names:
+        stored = md_store_read(md_dir, BASE_CANONICAL + name)
+        assert stored is not None and stored.title == name
+    err = capsys.readouterr().err
+    assert "Error converting escape.html" in err
+    assert err.count("Error converting") == 1
@@ -100,6 +100,15 @@ def test_read_documentation_missing_file(sample_settings: Settings) -> None:
     assert str(exc_info.value).startswith("NotFound")
 
 
+def test_read_documentation_reports_canonical_url(sample_settings: Settings) -> None:
+    configure_from_settings(sample_settings)
+    url = "https://DOC.qt.io/archives/qt-4.8//qsample.html"
+    result = asyncio.run(read_documentation(url))
+
+    assert result["url"] == url
+    assert result["canonical_url"] == _canonical_url()
+
+
 def test_read_documentation_returns_section_only(sample_settings: Settings) -> None:
     configure_from_settings(sample_settings)
     result_full = asyncio.run(read_documentation(_canonical_url()))
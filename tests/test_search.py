@@ -1,12 +1,18 @@
 """Tests for search.py FTS5 indexing and querying."""
 import asyncio
+import hashlib
+import shutil
+import sqlite3
+from collections.abc import Iterator
 from pathlib import Path
 
 import pytest
 
+import qt4_doc_mcp_server.search as search_mod
 from qt4_doc_mcp_server.config import Settings, ensure_dirs, probe_fts5
 from qt4_doc_mcp_server.search import (
     build_index,
+    index_is_current,
     search,
     SearchResult,
     SearchUnavailable,
@@ -14,108 +20,177 @@ from qt4_doc_mcp_server.search import (
 )
 from qt4_doc_mcp_server.tools import configure_from_settings, search_documentation
 
-pytest.importorskip("bs4")
+DATA_DIR = Path(__file__).parent / "data"
+SAMPLE_DOCS = (
+    "object-model.html", "qstring.html", "qwidget.html", "signals-slots.html"
+)
+PREBUILT_INDEX = DATA_DIR / "fts_sample.sqlite"
 
+# Test databases live in tmp_path and are thrown away, so index builds here
+# also skip the rollback journal on disk and take the lock once
+_TEST_BUILD_PRAGMAS = search_mod.BUILD_PRAGMAS + (
+    "PRAGMA journal_mode=MEMORY",
+    "PRAGMA locking_mode=EXCLUSIVE",
+)
 
-@pytest.fixture()
-def sample_docs(tmp_path: Path) -> Path:
-    """Create sample HTML documentation for testing."""
-    docs_dir = tmp_path / "docs"
-    docs_dir.mkdir()
-
-    # Create a few test HTML files
-    (docs_dir / "qstring.html").write_text(
-        """
-        <html>
-          <head><title>QString Class Reference</title></head>
-          <body>
-            <div class="mainContent">
-              <h1>QString Class Reference</h1>
-              <p>The QString class provides a Unicode character string.</p>
-              <h2>Public Functions</h2>
-              <p>QString provides many functions for manipulating strings.</p>
-            </div>
-          </body>
-        </html>
-        """,
-        encoding="utf-8",
-    )
 
-    (docs_dir / "qwidget.html").write_text(
-        """
-        <html>
-          <head><title>QWidget Class Reference</title></head>
-          <body>
-            <div class="mainContent">
-              <h1>QWidget Class Reference</h1>
-              <p>The QWidget class is the base class of all user interface objects.</p>
-              <h2>Signals and Slots</h2>
-              <p>Widgets can emit signals and have slots for receiving signals.</p>
-            </div>
-          </body>
-        </html>
-        """,
-        encoding="utf-8",
-    )
+@pytest.fixture(autouse=True)
+def _fast_build_pragmas(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(search_mod, "BUILD_PRAGMAS", _TEST_BUILD_PRAGMAS)
 
-    (docs_dir / "signals-slots.html").write_text(
-        """
-        <html>
-          <head><title>Signals and Slots</title></head>
-          <body>
-            <div class="mainContent">
-              <h1>Signals and Slots</h1>
-              <p>Signals and slots are used for communication between objects.</p>
-              <h2>Overview</h2>
-              <p>The signals and slots mechanism is a central feature of Qt.</p>
-            </div>
-          </body>
-        </html>
-        """,
-        encoding="utf-8",
-    )
 
+@pytest.fixture(scope="session")
+def _html_parsers() -> None:
+    """Skip tests that parse HTML when bs4 or lxml is not installed."""
+    pytest.importorskip("bs4")
+    pytest.importorskip("lxml")
+
+
+@pytest.fixture(scope="session")
+def sample_docs(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Link the sample HTML documentation into a docs tree once per session."""
+    docs_dir = tmp_path_factory.mktemp("docs")
+    for name in SAMPLE_DOCS:
+        try:
+            (docs_dir / name).hardlink_to(DATA_DIR / name)
+        except OSError:
+            # Windows or cross-filesystem tmp dirs
+            shutil.copyfile(DATA_DIR / name, docs_dir / name)
     return docs_dir
 
 
-@pytest.fixture()
-def sample_settings(tmp_path: Path, sample_docs: Path) -> Settings:
-    """Create test settings with sample docs."""
+@pytest.fixture(scope="session")
+def _prebuilt_index() -> Iterator[sqlite3.Connection]:
+    """The committed FTS5 index over the sample docs, loaded into memory once.
+
+    Query tests clone this connection instead of re-parsing HTML. Regenerate
+    the file with ``python scripts/build_test_index.py`` whenever the schema
+    or the text extraction changes.
+    """
+    src = sqlite3.connect(":memory:")
+    disk = sqlite3.connect(PREBUILT_INDEX.as_uri() + "?mode=ro", uri=True)
+    try:
+        disk.backup(src)
+    finally:
+        disk.close()
+    row = src.execute(
+        "SELECT value FROM meta WHERE key = 'schema_version'"
+    ).fetchone()
+    if row is None or row[0] != search_mod.SCHEMA_VERSION:
+        src.close()
+        pytest.fail(
+            f"{PREBUILT_INDEX.name} is stale (schema {row and row[0]}, expected "
+            f"{search_mod.SCHEMA_VERSION}); run scripts/build_test_index.py"
+        )
+    yield src
+    src.close()
+
+
+def _clone_index(src: sqlite3.Connection, db_path: Path) -> None:
+    """Copy the prebuilt index into db_path with SQLite's online backup API."""
+    dst = sqlite3.connect(str(db_path))
+    try:
+        # Keep the rollback journal off disk while the pages are copied
+        dst.execute("PRAGMA journal_mode=MEMORY")
+        src.backup(dst)
+    finally:
+        dst.close()
+
+
+@pytest.fixture(scope="session")
+def _shared_index(
+    tmp_path_factory: pytest.TempPathFactory, _prebuilt_index: sqlite3.Connection
+) -> Path:
+    """Session-wide index file for tests that only query it."""
+    db_path = tmp_path_factory.mktemp("readonly") / "fts.sqlite"
+    _clone_index(_prebuilt_index, db_path)
+    return db_path
+
+
+def _make_settings(tmp_path: Path, docs: Path) -> Settings:
     settings = Settings(
-        qt_doc_base=sample_docs,
+        qt_doc_base=docs,
         md_cache_dir=tmp_path / "cache" / "md",
         index_db_path=tmp_path / "index" / "fts.sqlite",
         preindex_docs=False,
         preconvert_md=False,
         md_cache_size=4,
+        html_parser="lxml",
     )
     ensure_dirs(settings)
     return settings
 
 
+def _index_rows(db_path: Path) -> list[tuple]:
+    con = sqlite3.connect(str(db_path))
+    try:
+        return con.execute(
+            "SELECT rowid, title, headings, body, url, path_rel FROM docs ORDER BY rowid"
+        ).fetchall()
+    finally:
+        con.close()
+
+
+def _index_checksum(db_path: Path) -> str:
+    h = hashlib.sha256()
+    for row in _index_rows(db_path):
+        h.update("\x1f".join(map(str, row)).encode("utf-8"))
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+
+@pytest.fixture()
+def fresh_settings(
+    tmp_path: Path, sample_docs: Path, _html_parsers: None
+) -> Settings:
+    """Create test settings with sample docs and no index built yet."""
+    return _make_settings(tmp_path, sample_docs)
+
+
+@pytest.fixture()
+def sample_settings(
+    tmp_path: Path,
+    sample_docs: Path,
+    _prebuilt_index: sqlite3.Connection,
+) -> Settings:
+    """Create test settings with a private copy of the prebuilt index."""
+    settings = _make_settings(tmp_path, sample_docs)
+    _clone_index(_prebuilt_index, settings.index_db_path)
+    return settings
+
+
+@pytest.fixture()
+def configured_index(sample_settings: Settings) -> Settings:
+    """Point the MCP tools at a private copy of the prebuilt index."""
+    configure_from_settings(sample_settings)
+    return sample_settings
+
+
 def test_fts5_available() -> None:
     """Test that FTS5 is available in the test environment."""
     assert probe_fts5(), "SQLite FTS5 must be available for search tests"
 
 
-def test_build_index_creates_database(sample_settings: Settings) -> None:
+def test_build_index_creates_database(fresh_settings: Settings) -> None:
     """Test that build_index creates a valid FTS5 database."""
-    db_path = sample_settings.index_db_path
-    docs_base = sample_settings.qt_doc_base
+    db_path = fresh_settings.index_db_path
+    docs_base = fresh_settings.qt_doc_base
 
     assert not db_path.exists(), "Index should not exist yet"
+    assert not index_is_current(db_path)
 
     stats = build_index(db_path, docs_base)
 
     assert db_path.exists(), "Index database should be created"
-    assert stats["indexed"] == 3, "Should index all 3 HTML files"
+    assert index_is_current(db_path)
+    assert stats["indexed"] == 4, "Should index all 4 HTML files"
     assert stats["errors"] == 0, "Should have no errors"
 
 
-def test_build_index_with_progress_callback(sample_settings: Settings) -> None:
+def test_build_index_with_progress_callback(fresh_settings: Settings) -> None:
     """Test that build_index calls progress callback."""
-    db_path = sample_settings.index_db_path
-    docs_base = sample_settings.qt_doc_base
+    db_path = fresh_settings.index_db_path
+    docs_base = fresh_settings.qt_doc_base
 
     progress_calls = []
 
@@ -124,89 +199,133 @@ def test_build_index_with_progress_callback(sample_settings: Settings) -> None:
 
     stats = build_index(db_path, docs_base, progress_callback=progress)
 
-    assert len(progress_calls) == 3, "Should call progress for each file"
-    assert stats["indexed"] == 3
+    assert len(progress_calls) == 4, "Should call progress for each file"
+    assert stats["indexed"] == 4
 
 
-def test_search_returns_relevant_results(sample_settings: Settings) -> None:
-    """Test that search returns relevant results ranked by BM25."""
-    db_path = sample_settings.index_db_path
-    docs_base = sample_settings.qt_doc_base
+def test_build_index_parallel_matches_serial(
+    fresh_settings: Settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the process-pool parse path yields the same index content."""
+    db_path = fresh_settings.index_db_path
+    docs_base = fresh_settings.qt_doc_base
 
-    # Build index first
     build_index(db_path, docs_base)
+    serial_rows = _index_rows(db_path)
 
-    # Search for "QString"
-    results = search(db_path, "QString")
-
-    assert len(results) > 0, "Should find results"
-    assert results[0].title == "QString Class Reference"
-    assert "QString" in results[0].context or "QString" in results[0].title
-
-
-def test_search_with_limit(sample_settings: Settings) -> None:
-    """Test that search respects the limit parameter."""
-    db_path = sample_settings.index_db_path
-    docs_base = sample_settings.qt_doc_base
-
-    build_index(db_path, docs_base)
+    monkeypatch.setattr(search_mod, "PARALLEL_MIN_FILES", 1)
+    monkeypatch.setattr(search_mod.os, "cpu_count", lambda: 2)
+    stats = build_index(db_path, docs_base)
 
-    # Search with limit=1
-    results = search(db_path, "signals", limit=1)
+    assert stats["indexed"] == 4
+    assert _index_rows(db_path) == serial_rows
 
-    assert len(results) <= 1, "Should respect limit"
 
+def test_build_index_uses_configured_parser(
+    fresh_settings: Settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that build_index hands the configured tree builder to BeautifulSoup."""
+    real_soup = search_mod.BeautifulSoup
+    builders = []
+
+    def recording_soup(markup, features=None, *args, **kwargs):
+        if markup:  # skip build_index's up-front parser check
+            builders.append(features)
+        return real_soup(markup, features, *args, **kwargs)
+
+    monkeypatch.setattr(search_mod, "BeautifulSoup", recording_soup)
+    stats = build_index(
+        fresh_settings.index_db_path,
+        fresh_settings.qt_doc_base,
+        html_parser=fresh_settings.html_parser,
+    )
 
-def test_search_multiple_terms(sample_settings: Settings) -> None:
-    """Test searching with multiple terms."""
-    db_path = sample_settings.index_db_path
-    docs_base = sample_settings.qt_doc_base
+    assert stats["indexed"] == 4
+    assert builders == ["lxml"] * 4
 
-    build_index(db_path, docs_base)
 
-    # Search for "signals slots"
-    results = search(db_path, "signals slots")
+def test_walk_html_files_skips_unreadable_dirs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a directory scandir cannot open is skipped, not fatal."""
+    (tmp_path / "locked").mkdir()
+    (tmp_path / "locked" / "hidden.html").write_text("<p></p>")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "page.html").write_text("<p></p>")
+    (tmp_path / "index.html").write_text("<p></p>")
+
+    real_scandir = search_mod.os.scandir
+
+    def scandir(path):
+        if Path(path).name == "locked":
+            raise PermissionError(13, "Permission denied", path)
+        return real_scandir(path)
+
+    monkeypatch.setattr(search_mod.os, "scandir", scandir)
+    found = sorted(
+        Path(p).relative_to(tmp_path).as_posix()
+        for p in search_mod.walk_html_files(tmp_path)
+    )
 
-    assert len(results) > 0, "Should find results for multi-term query"
-    # The signals-slots.html should rank highly
-    titles = [r.title for r in results]
-    assert "Signals and Slots" in titles
+    assert found == ["index.html", "sub/page.html"]
 
 
-def test_search_empty_query_returns_empty(sample_settings: Settings) -> None:
-    """Test that empty queries return no results."""
+@pytest.mark.parametrize("missing_bs4", [False, True], ids=["unknown", "no-bs4"])
+def test_build_index_rejects_unusable_parser(
+    sample_settings: Settings,
+    _html_parsers: None,
+    monkeypatch: pytest.MonkeyPatch,
+    missing_bs4: bool,
+) -> None:
+    """Test that a bad html_parser fails up front and keeps the old index."""
     db_path = sample_settings.index_db_path
-    docs_base = sample_settings.qt_doc_base
+    before = _index_checksum(db_path)
+    if missing_bs4:
+        monkeypatch.setattr(search_mod, "BeautifulSoup", None)
 
-    build_index(db_path, docs_base)
+    with pytest.raises(SearchIndexError):
+        build_index(db_path, sample_settings.qt_doc_base, html_parser="lxmll")
 
-    results = search(db_path, "")
-    assert len(results) == 0
+    assert _index_checksum(db_path) == before
 
-    results = search(db_path, "   ")
-    assert len(results) == 0
 
+def test_extract_text_content_lexbor_matches_bs4(
+    sample_docs: Path, monkeypatch: pytest.MonkeyPatch, _html_parsers: None
+) -> None:
+    """Test that the selectolax fast path extracts the same text as bs4."""
+    pytest.importorskip("selectolax.lexbor")
 
-def test_search_nonexistent_index_raises(sample_settings: Settings) -> None:
-    """Test that searching nonexistent index raises SearchUnavailable."""
-    db_path = sample_settings.index_db_path
+    htmls = [p.read_bytes() for p in sorted(sample_docs.glob("*.html"))]
+    htmls.append(
+        b'<div class="mainContent"><h2>B<script>x</script> <style>y</style>C</h2>'
+        b"<p>body<script>z</script> text</p></div>"
+    )
+    fast = [search_mod._extract_text_content_lexbor(html) for html in htmls]
 
-    assert not db_path.exists()
+    monkeypatch.setattr(search_mod, "LexborHTMLParser", None)
+    slow = [search_mod._extract_text_content(html) for html in htmls]
 
-    with pytest.raises(SearchUnavailable):
-        search(db_path, "test")
+    assert fast == slow
 
 
-def test_search_result_structure(sample_settings: Settings) -> None:
-    """Test that SearchResult has the expected structure."""
-    db_path = sample_settings.index_db_path
-    docs_base = sample_settings.qt_doc_base
+def test_extract_text_content_title_fallback(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the regex title extraction used when no HTML parser is available."""
+    monkeypatch.setattr(search_mod, "LexborHTMLParser", None)
+    monkeypatch.setattr(search_mod, "BeautifulSoup", None)
 
-    build_index(db_path, docs_base)
-    results = search(db_path, "QString")
+    html = '<HTML><HEAD><Title lang="en"> QString Class </TITLE></HEAD></HTML>'
+    assert search_mod._extract_text_content(html) == ("QString Class", "", "")
+    assert search_mod._extract_text_content("<p>no title</p>") == ("", "", "")
+    assert search_mod._extract_text_content(html.encode("utf-8")) == (
+        "QString Class", "", ""
+    )
 
-    assert len(results) > 0
+
+def _check_qstring(results: list[SearchResult]) -> None:
+    assert results, "Should find results"
     result = results[0]
+    assert result.title == "QString Class Reference"
+    assert "QString" in result.context or "QString" in result.title
 
     assert isinstance(result, SearchResult)
     assert isinstance(result.title, str)
@@ -216,14 +335,123 @@ def test_search_result_structure(sample_settings: Settings) -> None:
     assert result.url.startswith("https://doc.qt.io/archives/qt-4.8/")
 
 
-@pytest.mark.asyncio
-async def test_search_documentation_tool(sample_settings: Settings) -> None:
-    """Test the search_documentation MCP tool."""
-    configure_from_settings(sample_settings)
+def _check_titles_include(title: str):
+    def check(results: list[SearchResult]) -> None:
+        assert title in [r.title for r in results]
+
+    return check
+
+
+def _check_last_title(title: str):
+    def check(results: list[SearchResult]) -> None:
+        assert results and results[-1].title == title
+
+    return check
+
+
+def _check_at_most(n: int):
+    def check(results: list[SearchResult]) -> None:
+        assert len(results) <= n, "Should respect limit"
+
+    return check
+
+
+def _check_empty(results: list[SearchResult]) -> None:
+    assert results == []
+
+
+SEARCH_CASES = [
+    pytest.param("QString", None, _check_qstring, id="relevant-result-structure"),
+    pytest.param("signals", 1, _check_at_most(1), id="limit"),
+    pytest.param(
+        "signals slots", None, _check_titles_include("Signals and Slots"),
+        id="multiple-terms",
+    ),
+    # Title matches outrank heading/body matches (weighted bm25); unweighted,
+    # the body-heavy Object Model page would rank first
+    pytest.param(
+        "class", None, _check_last_title("Object Model"), id="title-ranking"
+    ),
+    # Served by the FTS5 prefix index (see test_index_declares_prefix_indexes)
+    pytest.param(
+        "QStr*", None, _check_titles_include("QString Class Reference"), id="prefix"
+    ),
+    pytest.param("", None, _check_empty, id="empty-query"),
+    pytest.param("   ", None, _check_empty, id="blank-query"),
+]
+
+
+@pytest.mark.parametrize("query,limit,check", SEARCH_CASES)
+def test_search_behaviours(_shared_index: Path, query, limit, check) -> None:
+    """Test search results against the shared read-only index."""
+    if limit is None:
+        results = search(_shared_index, query)
+    else:
+        results = search(_shared_index, query, limit=limit)
+    check(results)
+
+
+def test_index_declares_prefix_indexes(_shared_index: Path) -> None:
+    """Test that the docs table is created with FTS5 prefix indexes."""
+    con = sqlite3.connect(str(_shared_index))
+    try:
+        (sql,) = con.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'docs'"
+        ).fetchone()
+    finally:
+        con.close()
+    assert "prefix='2 3 4'" in sql
+
+
+def test_search_sees_rebuilt_index(
+    tmp_path: Path,
+    sample_docs: Path,
+    _html_parsers: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that the cached query connection picks up a rebuilt index."""
+    # Simulate a rebuild by another process: only the file identity check
+    # can invalidate the cached connection
+    monkeypatch.setattr(search_mod, "_close_conn", lambda db_path: None)
+    docs_base = tmp_path / "docs"
+    shutil.copytree(sample_docs, docs_base)
+    settings = _make_settings(tmp_path, docs_base)
+    db_path = settings.index_db_path
+
+    build_index(db_path, docs_base)
+    assert search(db_path, "QString")
+
+    (docs_base / "qstring.html").unlink()
+    build_index(db_path, docs_base)
+
+    titles = [r.title for r in search(db_path, "QString")]
+    assert "QString Class Reference" not in titles
 
-    # Build index
-    build_index(sample_settings.index_db_path, sample_settings.qt_doc_base)
 
+def test_search_nonexistent_index_raises(tmp_path: Path, sample_docs: Path) -> None:
+    """Test that searching nonexistent index raises SearchUnavailable."""
+    db_path = _make_settings(tmp_path, sample_docs).index_db_path
+
+    assert not db_path.exists()
+
+    with pytest.raises(SearchUnavailable):
+        search(db_path, "test")
+
+
+def test_search_index_removed_after_exists_check(
+    _shared_index: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that an index unlinked mid-query raises SearchUnavailable."""
+    missing = _shared_index.with_name("removed.sqlite")
+    monkeypatch.setattr(Path, "exists", lambda self: True)
+
+    with pytest.raises(SearchUnavailable):
+        search(missing, "QString")
+
+
+@pytest.mark.asyncio
+async def test_search_documentation_tool(configured_index: Settings) -> None:
+    """Test the search_documentation MCP tool."""
     # Test search tool
     result = await search_documentation(query="QString", limit=5)
 
@@ -243,11 +471,13 @@ async def test_search_documentation_tool(sample_settings: Settings) -> None:
 
 
 @pytest.mark.asyncio
-async def test_search_documentation_tool_no_index(sample_settings: Settings) -> None:
+async def test_search_documentation_tool_no_index(
+    tmp_path: Path, sample_docs: Path
+) -> None:
     """Test search_documentation tool raises ToolError when index missing."""
     from mcp.server.fastmcp.exceptions import ToolError
 
-    configure_from_settings(sample_settings)
+    configure_from_settings(_make_settings(tmp_path, sample_docs))
 
     # Don't build index - should raise ToolError
     with pytest.raises(ToolError) as exc_info:
@@ -258,12 +488,9 @@ async def test_search_documentation_tool_no_index(sample_settings: Settings) ->
 
 @pytest.mark.asyncio
 async def test_search_documentation_tool_limit_validation(
-    sample_settings: Settings,
+    configured_index: Settings,
 ) -> None:
     """Test that search_documentation validates and clamps limit."""
-    configure_from_settings(sample_settings)
-    build_index(sample_settings.index_db_path, sample_settings.qt_doc_base)
-
     # Test limit too low
     result = await search_documentation(query="signals", limit=-5)
     assert result["count"] >= 0  # Should use default
@@ -275,14 +502,11 @@ async def test_search_documentation_tool_limit_validation(
 
 @pytest.mark.asyncio
 async def test_search_documentation_scope_validation(
-    sample_settings: Settings,
+    configured_index: Settings,
 ) -> None:
     """Test that search_documentation validates scope parameter."""
     from mcp.server.fastmcp.exceptions import ToolError
 
-    configure_from_settings(sample_settings)
-    build_index(sample_settings.index_db_path, sample_settings.qt_doc_base)
-
     # Invalid scope should raise error
     with pytest.raises(ToolError) as exc_info:
         await search_documentation(query="test", scope="invalid")
@@ -296,19 +520,28 @@ async def test_search_documentation_scope_validation(
     assert "currently supported" in str(exc_info.value).lower()
 
 
-def test_build_index_deterministic(sample_settings: Settings) -> None:
+def test_build_index_deterministic(fresh_settings: Settings, tmp_path: Path) -> None:
     """Test that index builds are deterministic."""
-    db_path = sample_settings.index_db_path
-    docs_base = sample_settings.qt_doc_base
+    docs_base = fresh_settings.qt_doc_base
+    first = fresh_settings.index_db_path
+    second = tmp_path / "rebuilt" / "fts.sqlite"
 
-    # Build index twice
-    stats1 = build_index(db_path, docs_base)
-    size1 = db_path.stat().st_size
+    stats1 = build_index(first, docs_base)
+    stats2 = build_index(second, docs_base)
 
-    # Rebuild
-    stats2 = build_index(db_path, docs_base)
-    size2 = db_path.stat().st_size
+    assert stats1 == stats2 == {"indexed": 4, "skipped": 0, "errors": 0}
+    assert _index_checksum(first) == _index_checksum(
+        second
+    ), "Index content should be identical across builds"
+
+
+def test_prebuilt_index_fixture_is_current(
+    sample_settings: Settings, tmp_path: Path, _html_parsers: None
+) -> None:
+    """Test that the committed index fixture matches a fresh lxml build."""
+    rebuilt = tmp_path / "rebuilt" / "fts.sqlite"
+    build_index(rebuilt, sample_settings.qt_doc_base, html_parser="lxml")
 
-    assert stats1 == stats2, "Stats should be identical"
-    # Note: Size might vary slightly due to SQLite internals, but should be very close
-    assert abs(size1 - size2) < 10000, "Index size should be nearly identical"
+    assert _index_checksum(rebuilt) == _index_checksum(
+        sample_settings.index_db_path
+    ), f"{PREBUILT_INDEX.name} is stale; run scripts/build_test_index.py"